@@ -2,6 +2,7 @@
 
 import os
 from pathlib import Path
+from typing import List
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,6 +13,16 @@ class Settings(BaseSettings):
     openrouter_api_key: str
     fastapi_port: int = 8000
     dev_mode: bool = False  # Skip image generation for faster testing
+    dev_stub_text: bool = False  # In dev mode, also return stubbed text instead of calling the LLM
+    mongodb_max_pool_size: int = 100  # Motor connection pool ceiling per process
+    mongodb_min_pool_size: int = 10  # Connections kept warm so bursts skip the TCP/TLS handshake
+    mongodb_max_idle_time_ms: int = 300000  # Recycle pooled connections idle for 5 minutes
+    llm_max_concurrency: int = 10  # Max in-flight OpenRouter text requests (avoids 429 thrash)
+    llm_max_image_concurrency: int = 4  # Separate cap for slow image requests (never block text calls)
+    llm_cache_ttl_seconds: int = 3600  # TTL for cached deterministic LLM responses
+    llm_cache_max_entries: int = 1024  # Max cached LLM responses per process
+    llm_max_retries: int = 3  # Retries for 429/5xx OpenRouter responses (jittered backoff)
+    llm_multi_completion_models: List[str] = []  # Models whose provider honors "n" > 1 (batched completions)
 
     model_config = SettingsConfigDict(
         env_file=str(Path(__file__).parent.parent.parent / ".env"),
@@ -1,5 +1,7 @@
 """MongoDB database connection using Motor (async driver)."""
 
+from functools import lru_cache
+from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from app.config import settings
 
@@ -12,7 +14,12 @@ def get_client() -> AsyncIOMotorClient:
     """Get or create the MongoDB client."""
     global _client
     if _client is None:
-        _client = AsyncIOMotorClient(settings.mongodb_uri)
+        _client = AsyncIOMotorClient(
+            settings.mongodb_uri,
+            maxPoolSize=settings.mongodb_max_pool_size,
+            minPoolSize=settings.mongodb_min_pool_size,
+            maxIdleTimeMS=settings.mongodb_max_idle_time_ms,
+        )
     return _client
 
 
@@ -29,6 +36,25 @@ def get_database() -> AsyncIOMotorDatabase:
     return _database
 
 
+@lru_cache(maxsize=1024)
+def to_object_id(value: str) -> ObjectId:
+    """Parse a session/document ID string into an ObjectId.
+
+    Cached because one request parses the same session ID several times
+    (load, recovery, updates). ObjectIds are immutable, so sharing is safe.
+
+    Args:
+        value: 24-character hex ID string
+
+    Returns:
+        Parsed ObjectId
+
+    Raises:
+        bson.errors.InvalidId: If the string is not a valid ObjectId
+    """
+    return ObjectId(value)
+
+
 async def close_database():
     """Close the MongoDB connection."""
     global _client, _database
@@ -54,4 +80,11 @@ async def ensure_indexes():
         background=True
     )
 
+    # Expire cached scene intensities after a week (keyed by story segment hash)
+    await db["intensity_cache"].create_index(
+        "createdAt",
+        name="intensity_cache_ttl_index",
+        expireAfterSeconds=7 * 24 * 60 * 60
+    )
+
     print("✅ Database indexes created successfully")
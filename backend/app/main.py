@@ -10,6 +10,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.logger import logger
 from app.database import close_database, ensure_indexes
+from app.services.llm_service import close_llm_service
 from app.routers import adventure
 from app.error_handlers import add_error_handlers
 
@@ -46,6 +47,7 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     logger.info("Shutting down...")
+    await close_llm_service()
     await close_database()
 
 
@@ -126,3 +126,42 @@ class GameSession(BaseModel):
     class Config:
         populate_by_name = True
         json_encoders = {datetime: lambda v: v.isoformat()}
+
+
+class OpenRouterImageURL(BaseModel):
+    """Image URL wrapper in an OpenRouter message."""
+
+    url: str
+
+
+class OpenRouterImage(BaseModel):
+    """Generated image attached to an OpenRouter message."""
+
+    image_url: OpenRouterImageURL
+
+
+class OpenRouterMessage(BaseModel):
+    """Assistant message returned by OpenRouter chat/completions."""
+
+    content: Optional[str] = None
+    images: List[OpenRouterImage] = Field(default_factory=list)
+
+
+class OpenRouterChoice(BaseModel):
+    """Single completion choice."""
+
+    message: OpenRouterMessage
+
+
+class OpenRouterError(BaseModel):
+    """Error object embedded in an OpenRouter response body."""
+
+    message: str = "Unknown error"
+    code: Optional[int | str] = None
+
+
+class OpenRouterResponse(BaseModel):
+    """OpenRouter chat/completions response (only the fields we read)."""
+
+    choices: List[OpenRouterChoice] = Field(default_factory=list)
+    error: Optional[OpenRouterError] = None
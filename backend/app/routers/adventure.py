@@ -1,10 +1,12 @@
 """API router for Märchenweber adventure endpoints."""
 
 from app.logger import logger
+import json
 import re
 from datetime import datetime
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from app.models import (
     AdventureStartRequest,
     AdventureStartResponse,
@@ -13,6 +15,8 @@ from app.models import (
     DetailedErrorResponse,
 )
 from app.services.game_engine import get_game_engine
+from app.database import to_object_id
+from app.services.session_manager import get_session_manager
 from app.exceptions import (
     MaerchenweberError,
     SessionNotFoundError,
@@ -138,7 +142,6 @@ async def process_turn(request: TurnRequest):
         )
 
     try:
-        from bson import ObjectId
         from app.database import get_database
 
         # Mark session as generating
@@ -146,7 +149,7 @@ async def process_turn(request: TurnRequest):
         collection = db["gamesessions"]
 
         result = await collection.update_one(
-            {"_id": ObjectId(request.session_id)},
+            {"_id": to_object_id(request.session_id)},
             {
                 "$set": {
                     "generation_status": "generating",
@@ -193,13 +196,21 @@ async def get_story_status(session_id: str):
         HTTPException: If session not found
     """
     try:
-        from bson import ObjectId
         from app.database import get_database
 
         db = get_database()
         collection = db["gamesessions"]
 
-        session = await collection.find_one({"_id": ObjectId(session_id)})
+        # Only what the status response needs (skips registry, summary, image history)
+        session = await collection.find_one(
+            {"_id": to_object_id(session_id)},
+            projection={
+                "generation_status": 1,
+                "generation_error": 1,
+                "round": 1,
+                "turns": 1,
+            }
+        )
 
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
@@ -285,13 +296,12 @@ async def get_session(session_id: str):
         HTTPException: If session not found
     """
     try:
-        from bson import ObjectId
         from app.database import get_database
 
         db = get_database()
         collection = db["gamesessions"]
 
-        session = await collection.find_one({"_id": ObjectId(session_id)})
+        session = await collection.find_one({"_id": to_object_id(session_id)})
 
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
@@ -306,6 +316,40 @@ async def get_session(session_id: str):
         raise HTTPException(status_code=500, detail="Failed to fetch session")
 
 
+@router.get("/session/{session_id}/turns")
+async def stream_session_turns(session_id: str):
+    """Stream a session's turns as NDJSON (one turn per line).
+
+    Lets the client render the first turns of a long story before the rest
+    has been read from the database.
+
+    Args:
+        session_id: The game session ID
+
+    Returns:
+        StreamingResponse with application/x-ndjson content
+
+    Raises:
+        HTTPException: If session not found
+    """
+    session_mgr = get_session_manager()
+
+    try:
+        exists = await session_mgr.session_exists(session_id)
+    except Exception as e:
+        logger.error(f"Error fetching session turns: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch session")
+
+    if not exists:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    async def ndjson_lines():
+        async for turn in session_mgr.stream_turns(session_id):
+            yield json.dumps(jsonable_encoder(turn), ensure_ascii=False) + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
 @router.get("/image/{session_id}/{round}")
 async def get_image_status(session_id: str, round: int):
     """Poll for async image generation status for a specific round.
@@ -326,7 +370,6 @@ async def get_image_status(session_id: str, round: int):
     Raises:
         SessionNotFoundError: If session not found
     """
-    from bson import ObjectId
     from app.database import get_database
 
     logger.info(
@@ -338,7 +381,14 @@ async def get_image_status(session_id: str, round: int):
     collection = db["gamesessions"]
 
     try:
-        session = await collection.find_one({"_id": ObjectId(session_id)})
+        # Fetch the pending image and only the history entry for this round
+        session = await collection.find_one(
+            {"_id": to_object_id(session_id)},
+            projection={
+                "pending_image": 1,
+                "image_history": {"$elemMatch": {"round": round}},
+            }
+        )
     except Exception as e:
         logger.error(f"Invalid session ID format: {session_id}")
         raise ValidationError(
@@ -418,7 +468,6 @@ async def get_user_sessions(user_id: str):
         HTTPException: If query fails
     """
     try:
-        from bson import ObjectId
         from app.database import get_database
 
         db = get_database()
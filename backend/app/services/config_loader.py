@@ -2,7 +2,7 @@
 
 import random
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
 import yaml
 from jinja2 import Template
 
@@ -27,6 +27,9 @@ class ConfigLoader:
         with open(config_path, "r", encoding="utf-8") as f:
             self._config: Dict[str, Any] = yaml.safe_load(f)
 
+        # Compiled Jinja2 templates by prompt name (parsed on first use)
+        self._templates: Dict[str, Template] = {}
+
     def get_model(self, model_name: str) -> str:
         """Get model identifier by name.
 
@@ -51,6 +54,23 @@ class ConfigLoader:
         Returns:
             Rendered prompt string
         """
+        template = self._templates.get(prompt_name)
+        if template is None:
+            template = self._templates[prompt_name] = Template(self._get_prompt_source(prompt_name))
+        return template.render(**kwargs)
+
+    def _get_prompt_source(self, prompt_name: str) -> str:
+        """Look up the raw template string for a prompt.
+
+        Args:
+            prompt_name: Name of the prompt, dotted for nested prompts
+
+        Returns:
+            Template source
+
+        Raises:
+            ValueError: If the prompt is not in the config
+        """
         prompts = self._config.get("prompts", {})
 
         # Handle nested prompts (e.g., choice_prompts.brave)
@@ -66,8 +86,7 @@ class ConfigLoader:
         if not template_str:
             raise ValueError(f"Prompt '{prompt_name}' not found in config")
 
-        template = Template(template_str)
-        return template.render(**kwargs)
+        return template_str
 
     def get_random_wildcard(self) -> str:
         """Get a random wildcard element to inject into the story.
@@ -116,6 +135,14 @@ class ConfigLoader:
             raise ValueError("Image variance configuration not found")
         return variance
 
+    def get_safety_blocklist(self) -> List[str]:
+        """Get words that send text to the validator LLM even with safety_fast_path on.
+
+        Returns:
+            List of blocklisted words (may be empty)
+        """
+        return self._config.get("safety_blocklist", [])
+
     def get_config(self) -> Dict[str, Any]:
         """Get the entire configuration dictionary.
 
@@ -5,9 +5,8 @@ import json
 from app.logger import logger
 from datetime import datetime
 from typing import Dict, Any
-from bson import ObjectId
 
-from app.database import get_database
+from app.database import get_database, to_object_id
 from app.services.config_loader import get_config_loader
 from app.services.llm_service import get_llm_service
 from app.services.character_manager import get_character_manager
@@ -82,15 +81,7 @@ class GameEngine:
         warnings = []
 
         try:
-            with timer.step("Generate Style Guide"):
-                style_guide = await self.story_gen.generate_style_guide(
-                    character_name=character_name,
-                    character_description=character_description,
-                    story_theme=story_theme
-                )
-                logger.info(f"Generated style guide: {style_guide[:100]}...")
-
-            with timer.step("Generate Opening Story"):
+            with timer.step("Generate Style Guide + Opening Story"):
                 narrator_prompt = self.config.get_prompt(
                     "character_creation",
                     character_name=character_name,
@@ -101,13 +92,22 @@ class GameEngine:
                 narrator_model = self.config.get_model("narrator")
                 narrator_params = self.config.get_sampling_params("narrator")
 
-                response_text = await self.llm.generate_text(
-                    prompt=narrator_prompt,
-                    model=narrator_model,
-                    sampling_params=narrator_params,
-                    json_mode=True,
+                # Independent LLM calls - run concurrently (style guide has its own fallback)
+                style_guide, response_text = await asyncio.gather(
+                    self.story_gen.generate_style_guide(
+                        character_name=character_name,
+                        character_description=character_description,
+                        story_theme=story_theme
+                    ),
+                    self.llm.generate_text(
+                        prompt=narrator_prompt,
+                        model=narrator_model,
+                        sampling_params=narrator_params,
+                        json_mode=True,
+                    ),
                 )
 
+                logger.info(f"Generated style guide: {style_guide[:100]}...")
                 logger.info(f"Received response (first 200 chars): {response_text[:200]}")
 
             with timer.step("Parse Narrator JSON Response"):
@@ -202,20 +202,21 @@ class GameEngine:
                     else:
                         logger.error(f"  ❌ {name}: EMPTY DESCRIPTION!")
 
+                char_entries = [(name, char_descriptions.get(name, "")) for name in char_names]
                 choice_prompt_text = await self.image_gen._generate_choice_prompt(
                     choice_made=f"Beginne das Abenteuer als {character_name}",
                     story_text=story_text,
-                    characters_in_scene=char_names,
-                    character_descriptions=char_descriptions
+                    char_entries=char_entries
                 )
 
-                intensity = await self.image_gen._analyze_scene_intensity(story_text)
+                story_head, story_key = self.image_gen._scene_head(story_text)
+                intensity = await self.image_gen._analyze_scene_intensity(story_head, story_key=story_key)
                 variance = self.image_gen.get_random_variance(intensity)
 
                 final_prompt = self.image_gen._build_final_prompt(
                     choice_prompt=choice_prompt_text,
                     style_guide=style_guide,
-                    character_descriptions=char_descriptions,
+                    char_entries=char_entries,
                     variance=variance
                 )
 
@@ -227,7 +228,7 @@ class GameEngine:
                 )
 
                 await self.collection.update_one(
-                    {"_id": ObjectId(session_id), "turns.round": 1},
+                    {"_id": to_object_id(session_id), "turns.round": 1},
                     {
                         "$set": {
                             "turns.$.image_url": image_url,
@@ -275,12 +276,14 @@ class GameEngine:
             AdventureStepResponse with story, image=null, and choices
         """
         try:
-            await self.session_mgr.recover_incomplete_turns(session_id)
-
             session = await self.session_mgr.load_session(session_id)
             if not session:
                 raise ValueError(f"Session not found: {session_id}")
 
+            # Reload only in the rare case that incomplete turns were removed
+            if await self.session_mgr.recover_incomplete_turns(session_id, session=session):
+                session = await self.session_mgr.load_session(session_id)
+
             turns = session.get("turns", [])
             new_round = session.get("round", 0) + 1
 
@@ -378,7 +381,7 @@ class GameEngine:
                 update_doc["$set"]["summary"] = current_summary
 
             await self.collection.update_one(
-                {"_id": ObjectId(session_id)},
+                {"_id": to_object_id(session_id)},
                 update_doc,
             )
 
@@ -449,7 +452,10 @@ class GameEngine:
         try:
             logger.info(f"🚀 [BACKGROUND TASK] Starting story generation for session {session_id}")
 
-            session = await self.session_mgr.load_session(session_id)
+            session = await self.session_mgr.load_session(
+                session_id,
+                fields=["userId", "character_name", "character_description", "story_theme"],
+            )
             if not session:
                 logger.error(f"❌ Session {session_id} not found")
                 return
@@ -464,7 +470,10 @@ class GameEngine:
 
             # Load the newly created session to get style_guide and character_registry
             new_session_id = result["session_id"]
-            new_session = await self.session_mgr.load_session(new_session_id)
+            new_session = await self.session_mgr.load_session(
+                new_session_id,
+                fields=["turns", "round", "style_guide", "character_registry"],
+            )
 
             if not new_session:
                 logger.error(f"❌ Newly created session {new_session_id} not found!")
@@ -475,7 +484,7 @@ class GameEngine:
 
             # Copy all data from the new session to the original session
             await self.collection.update_one(
-                {"_id": ObjectId(session_id)},
+                {"_id": to_object_id(session_id)},
                 {
                     "$set": {
                         "turns": new_session.get("turns", []),
@@ -489,7 +498,7 @@ class GameEngine:
             )
 
             # Delete the temporary new session
-            await self.collection.delete_one({"_id": ObjectId(new_session_id)})
+            await self.collection.delete_one({"_id": to_object_id(new_session_id)})
             logger.info(f"🗑️  [BACKGROUND TASK] Deleted temporary session {new_session_id}")
 
             logger.info(f"✅ [BACKGROUND TASK] Successfully generated story for session {session_id}")
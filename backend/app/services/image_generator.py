@@ -1,26 +1,74 @@
 """Async image generation service with choice-based prompts and RNG variance."""
 
-import asyncio
+import hashlib
+import json
 import random
-from typing import Dict, Any, List, Optional
+import re
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
-from app.database import get_database
+from app.database import get_database, to_object_id
 from app.services.config_loader import get_config_loader
 from app.services.llm_service import get_llm_service
-from app.exceptions import ImageGenerationError, LLMError
+from app.exceptions import LLMError
 from app.logger import logger
-from bson import ObjectId
+
+# Matches a leading ```/```json fence and a trailing ``` fence around LLM JSON output
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+# Only the opening of a story segment is sent to the scene analyzer
+SCENE_HEAD_CHARS = 500
+
+# Structured-output schema for the scene analyzer (otherwise json_mode falls back to the story schema)
+_SCENE_INTENSITY_SCHEMA = {
+    "name": "scene_intensity",
+    "schema": {
+        "type": "object",
+        "properties": {
+            "intensity_level": {
+                "type": "integer",
+                "description": "1=calm/peaceful, 3=moderate, 5=exciting/dramatic"
+            },
+            "suggested_perspective": {"type": "string"},
+            "suggested_lighting": {"type": "string"}
+        },
+        "required": ["intensity_level"],
+        "additionalProperties": False
+    }
+}
+
+# Dedicated RNG for variance picks (no need to share the global random state)
+_rng = random.Random()
 
 
 class ImageGenerator:
     """Handles async image generation with choice-based prompts and scene-aware variance."""
 
+    # Skeleton for the final image prompt (filled in by _build_final_prompt)
+    _FINAL_TMPL = (
+        "{choice} \nStyle: {style} \nCharacters: {chars} "
+        "\nPerspective: {persp} \nLighting: {light} \nFraming: {frame}"
+    )
+
     def __init__(self):
         self.config = get_config_loader()
         self.llm = get_llm_service()
         self.db = get_database()
         self.collection = self.db["gamesessions"]
+        self.intensity_cache = self.db["intensity_cache"]
+
+        # Config is loaded once per process, so resolve per-call lookups up front
+        self._image_model = self.config.get_model("image_generator")
+        self._choice_model = self.config.get_model("choice_image_generator")
+        self._choice_params = self.config.get_sampling_params("choice_image_generator")
+        self._scene_model = self.config.get_model("scene_analyzer")
+        self._scene_params = self.config.get_sampling_params("scene_analyzer")
+        variance_cfg = self.config.get_image_variance()
+        self._perspectives = tuple(variance_cfg["perspectives"])
+        self._framings = tuple(variance_cfg["framing"])
+        self._lighting_low = tuple(variance_cfg["lighting_by_intensity"]["low"])
+        self._lighting_medium = tuple(variance_cfg["lighting_by_intensity"]["medium"])
+        self._lighting_high = tuple(variance_cfg["lighting_by_intensity"]["high"])
 
     def get_random_variance(self, intensity_level: int) -> Dict[str, str]:
         """Select random variance parameters based on scene intensity.
@@ -31,23 +79,21 @@ class ImageGenerator:
         Returns:
             Dict with perspective, lighting, framing
         """
-        variance_config = self.config.get_image_variance()
-
         # Select perspective randomly
-        perspective = random.choice(variance_config["perspectives"])
+        perspective = _rng.choice(self._perspectives)
 
         # Select lighting based on intensity
         if intensity_level <= 2:
-            lighting_pool = variance_config["lighting_by_intensity"]["low"]
+            lighting_pool = self._lighting_low
         elif intensity_level <= 3:
-            lighting_pool = variance_config["lighting_by_intensity"]["medium"]
+            lighting_pool = self._lighting_medium
         else:
-            lighting_pool = variance_config["lighting_by_intensity"]["high"]
+            lighting_pool = self._lighting_high
 
-        lighting = random.choice(lighting_pool)
+        lighting = _rng.choice(lighting_pool)
 
         # Select framing randomly
-        framing = random.choice(variance_config["framing"])
+        framing = _rng.choice(self._framings)
 
         return {
             "perspective": perspective,
@@ -83,14 +129,16 @@ class ImageGenerator:
             character_descriptions: Dict mapping character name to description
             current_round: Current round number
         """
+        session_oid = to_object_id(session_id)
+        start_time = datetime.utcnow()
+
         try:
             logger.info(f"🎨 [IMAGE GEN START] Session: {session_id}, Round: {current_round}")
-            start_time = datetime.utcnow()
 
             # Step 1: Mark as generating
             logger.info(f"[STEP 1/6] Marking session as 'generating' in DB...")
             await self.collection.update_one(
-                {"_id": ObjectId(session_id)},
+                {"_id": session_oid},
                 {
                     "$set": {
                         "pending_image": {
@@ -110,17 +158,18 @@ class ImageGenerator:
             logger.info(f"[STEP 2/6] Generating choice-specific prompt...")
             logger.info(f"  - Choice: {choice_made[:60]}...")
             logger.info(f"  - Characters in scene: {characters_in_scene}")
+            char_entries = [(name, character_descriptions.get(name, "")) for name in characters_in_scene]
             choice_prompt_text = await self._generate_choice_prompt(
                 choice_made=choice_made,
                 story_text=story_text,
-                characters_in_scene=characters_in_scene,
-                character_descriptions=character_descriptions
+                char_entries=char_entries
             )
             logger.info(f"✅ [STEP 2/6] Choice prompt generated: {choice_prompt_text[:100]}...")
 
             # Step 3: Analyze scene for intensity (for variance)
             logger.info(f"[STEP 3/6] Analyzing scene intensity...")
-            intensity = await self._analyze_scene_intensity(story_text)
+            story_head, story_key = self._scene_head(story_text)
+            intensity = await self._analyze_scene_intensity(story_head, story_key=story_key)
             logger.info(f"✅ [STEP 3/6] Scene intensity: {intensity}/5")
 
             # Step 4: Get random variance parameters
@@ -133,14 +182,14 @@ class ImageGenerator:
             final_prompt = self._build_final_prompt(
                 choice_prompt=choice_prompt_text,
                 style_guide=style_guide,
-                character_descriptions=character_descriptions,
+                char_entries=char_entries,
                 variance=variance
             )
             logger.info(f"✅ [STEP 5/6] Final prompt built ({len(final_prompt)} chars)")
 
             # Step 6: Generate image (NO previous image input!)
             logger.info(f"[STEP 6/6] Calling LLM to generate image...")
-            image_model = self.config.get_model("image_generator")
+            image_model = self._image_model
             logger.info(f"  - Model: {image_model}")
             logger.info(f"  - Aspect ratio: 4:3")
             image_url = await self.llm.generate_image(
@@ -158,7 +207,7 @@ class ImageGenerator:
             duration = (end_time - start_time).total_seconds()
 
             result = await self.collection.update_one(
-                {"_id": ObjectId(session_id), "turns.round": current_round},
+                {"_id": session_oid, "turns.round": current_round},
                 {
                     "$set": {
                         "turns.$.image_url": image_url,
@@ -166,6 +215,7 @@ class ImageGenerator:
                             "status": "ready",
                             "round": current_round,
                             "image_url": image_url,
+                            "started_at": start_time,
                             "completed_at": end_time,
                             "error": None
                         }
@@ -198,17 +248,18 @@ class ImageGenerator:
                 exc_info=True
             )
 
-            # Mark as failed with detailed error info
+            # Mark as failed with detailed error info (keep original start time)
+            failed_at = datetime.utcnow()
             await self.collection.update_one(
-                {"_id": ObjectId(session_id)},
+                {"_id": session_oid},
                 {
                     "$set": {
                         "pending_image": {
                             "status": "failed",
                             "round": current_round,
                             "image_url": None,
-                            "started_at": datetime.utcnow(),
-                            "completed_at": datetime.utcnow(),
+                            "started_at": start_time,
+                            "completed_at": failed_at,
                             "error": error_message,
                             "error_type": error_type
                         }
@@ -220,16 +271,14 @@ class ImageGenerator:
         self,
         choice_made: str,
         story_text: str,
-        characters_in_scene: List[str],
-        character_descriptions: Dict[str, str]
+        char_entries: List[Tuple[str, str]]
     ) -> str:
         """Generate choice-specific image prompt.
 
         Args:
             choice_made: User's choice
             story_text: Current story
-            characters_in_scene: Character names in scene
-            character_descriptions: Character visual descriptions
+            char_entries: (name, description) pairs for characters in scene
 
         Returns:
             Choice-specific image prompt (English, 2-3 sentences)
@@ -237,13 +286,12 @@ class ImageGenerator:
         Raises:
             LLMError: If prompt generation fails
         """
+        model = self._choice_model
+        prompt = ""
+
         try:
             # Build character info for prompt
-            char_info = []
-            for name in characters_in_scene:
-                desc = character_descriptions.get(name, "")
-                if desc:
-                    char_info.append({"name": name, "description": desc})
+            char_info = [{"name": name, "description": desc} for name, desc in char_entries if desc]
 
             prompt = self.config.get_prompt(
                 "choice_image_generator",
@@ -252,13 +300,10 @@ class ImageGenerator:
                 characters_in_scene=char_info
             )
 
-            model = self.config.get_model("choice_image_generator")
-            params = self.config.get_sampling_params("choice_image_generator")
-
             result = await self.llm.generate_text(
                 prompt=prompt,
                 model=model,
-                sampling_params=params
+                sampling_params=self._choice_params
             )
 
             if not result or len(result.strip()) < 10:
@@ -281,42 +326,54 @@ class ImageGenerator:
                 original_error=e
             )
 
-    async def _analyze_scene_intensity(self, story_text: str) -> int:
+    @staticmethod
+    def _scene_head(story_text: str) -> Tuple[str, str]:
+        """Trim a story segment for scene analysis and hash it once.
+
+        Args:
+            story_text: Full story segment
+
+        Returns:
+            Tuple of (story head, hex cache key for the head)
+        """
+        story_head = story_text[:SCENE_HEAD_CHARS]
+        story_key = hashlib.blake2b(story_head.encode("utf-8"), digest_size=16).hexdigest()
+        return story_head, story_key
+
+    async def _analyze_scene_intensity(self, story_head: str, story_key: Optional[str] = None) -> int:
         """Analyze scene for intensity level (1-5).
 
         Args:
-            story_text: Story segment to analyze
+            story_head: Trimmed story segment to analyze (see _scene_head)
+            story_key: Optional cache key for the segment; enables the intensity cache
 
         Returns:
             Intensity level (1=calm, 5=exciting)
         """
         try:
+            if story_key:
+                cached = await self.intensity_cache.find_one({"_id": story_key})
+                if cached:
+                    logger.info(f"Scene intensity cache hit: {cached['intensity_level']}/5")
+                    return cached["intensity_level"]
+
             prompt = self.config.get_prompt(
                 "scene_intensity_analyzer",
-                story_segment=story_text[:500]
+                story_segment=story_head
             )
 
-            model = self.config.get_model("scene_analyzer")
-            params = self.config.get_sampling_params("scene_analyzer")
-
             result = await self.llm.generate_text(
                 prompt=prompt,
-                model=model,
-                sampling_params=params,
-                json_mode=True
+                model=self._scene_model,
+                sampling_params=self._scene_params,
+                json_mode=True,
+                json_schema=_SCENE_INTENSITY_SCHEMA
             )
 
-            import json
-
             # Clean up result (remove markdown code blocks if present)
             result_clean = result.strip()
-            if result_clean.startswith("```json"):
-                result_clean = result_clean[7:]
             if result_clean.startswith("```"):
-                result_clean = result_clean[3:]
-            if result_clean.endswith("```"):
-                result_clean = result_clean[:-3]
-            result_clean = result_clean.strip()
+                result_clean = _FENCE_RE.sub("", result_clean)
 
             data = json.loads(result_clean)
             intensity = data.get("intensity_level", 3)
@@ -326,6 +383,16 @@ class ImageGenerator:
                 logger.warning(f"Invalid intensity value: {intensity}, using default 3")
                 return 3
 
+            if story_key:
+                try:
+                    await self.intensity_cache.update_one(
+                        {"_id": story_key},
+                        {"$set": {"intensity_level": intensity, "createdAt": datetime.utcnow()}},
+                        upsert=True
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to cache scene intensity: {e}")
+
             return intensity
 
         except json.JSONDecodeError as e:
@@ -339,7 +406,7 @@ class ImageGenerator:
         self,
         choice_prompt: str,
         style_guide: str,
-        character_descriptions: Dict[str, str],
+        char_entries: List[Tuple[str, str]],
         variance: Dict[str, str]
     ) -> str:
         """Build final image generation prompt.
@@ -347,57 +414,53 @@ class ImageGenerator:
         Args:
             choice_prompt: Choice-specific action description
             style_guide: Visual style guide
-            character_descriptions: Character visual info
+            char_entries: (name, description) pairs for characters in scene
             variance: RNG variance parameters
 
         Returns:
             Final prompt for image generation
         """
         # Format character descriptions
-        char_lines = []
-        missing_descriptions = []
-
-        for name, desc in character_descriptions.items():
-            if desc:
-                char_lines.append(f"{name}: {desc}")
-            else:
-                missing_descriptions.append(name)
-                logger.warning(f"⚠️ Character '{name}' has NO description for image generation!")
+        char_lines = [f"{name}: {desc}" for name, desc in char_entries if desc]
+        missing_descriptions = [name for name, desc in char_entries if not desc]
 
         char_text = ", ".join(char_lines) if char_lines else "no specific character descriptions"
 
-        # Log character info
+        # Log character info (one line each, lazily formatted)
         if char_lines:
-            logger.info(f"✅ Characters with descriptions: {len(char_lines)}")
-            for line in char_lines:
-                logger.info(f"  - {line}")
+            logger.info("✅ Characters with descriptions (%d): %s", len(char_lines), " | ".join(char_lines))
 
         if missing_descriptions:
             logger.error(
-                f"❌ CONSISTENCY PROBLEM: {len(missing_descriptions)} character(s) "
-                f"without descriptions: {', '.join(missing_descriptions)}"
+                "❌ CONSISTENCY PROBLEM: %d character(s) without descriptions: %s",
+                len(missing_descriptions),
+                ", ".join(missing_descriptions)
             )
 
         # Build final prompt
-        prompt_parts = [
-            choice_prompt,
-            f"\nStyle: {style_guide}",
-            f"\nCharacters: {char_text}",
-            f"\nPerspective: {variance['perspective']}",
-            f"\nLighting: {variance['lighting']}",
-            f"\nFraming: {variance['framing']}"
-        ]
-
-        final_prompt = " ".join(prompt_parts)
-        logger.info(f"📝 Final image prompt length: {len(final_prompt)} characters")
+        final_prompt = self._FINAL_TMPL.format(
+            choice=choice_prompt,
+            style=style_guide,
+            chars=char_text,
+            persp=variance["perspective"],
+            light=variance["lighting"],
+            frame=variance["framing"]
+        )
+        logger.info("📝 Final image prompt length: %d characters", len(final_prompt))
 
         return final_prompt
 
 
+_image_generator: ImageGenerator | None = None
+
+
 def get_image_generator() -> ImageGenerator:
-    """Get an instance of the image generator.
+    """Get or create the global image generator instance.
 
     Returns:
         ImageGenerator instance
     """
-    return ImageGenerator()
+    global _image_generator
+    if _image_generator is None:
+        _image_generator = ImageGenerator()
+    return _image_generator
@@ -0,0 +1,107 @@
+"""In-process LLM response cache for deterministic (temperature 0) prompts."""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so prompts differing only in spacing share a cache entry.
+
+    Args:
+        prompt: Raw prompt text
+
+    Returns:
+        Prompt with runs of whitespace collapsed to single spaces
+    """
+    return " ".join(prompt.split())
+
+
+class LLMResponseCache:
+    """LRU cache with per-entry TTL for LLM responses.
+
+    The interface is async so a shared backend (e.g. Redis) can be swapped in
+    later without touching callers. The in-process implementation never awaits,
+    so no lock is needed on a single event loop.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: int = 3600):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached responses (oldest evicted first)
+            ttl_seconds: Default time-to-live for entries
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(
+        model: str,
+        prompt: str,
+        sampling_params: Dict[str, Any] | None = None,
+        json_schema: Dict[str, Any] | None = None,
+        json_mode: bool = False,
+    ) -> str:
+        """Build a stable cache key for a generate_text request.
+
+        Args:
+            model: Model identifier
+            prompt: Prompt text
+            sampling_params: Sampling parameters
+            json_schema: Custom JSON schema, if any
+            json_mode: Whether JSON output was requested
+
+        Returns:
+            Hex digest identifying the request
+        """
+        raw = json.dumps(
+            {
+                "model": model,
+                "prompt": normalize_prompt(prompt),
+                "sp": sampling_params,
+                "schema": json_schema,
+                "json_mode": json_mode,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        """Get a cached response.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached response or None if missing/expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: int | None = None):
+        """Store a response.
+
+        Args:
+            key: Cache key from make_key()
+            value: Response text
+            ttl: Optional TTL override in seconds
+        """
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.ttl_seconds)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -1,13 +1,178 @@
 """LLM service for OpenRouter API integration."""
 
+import asyncio
 import json
-from typing import Any, Dict, List
+import logging
+import random
+from typing import Any, AsyncIterator, Dict, Final, List, Tuple
 import httpx
 from app.config import settings
 from app.logger import logger
+from app.models import OpenRouterResponse
+from app.services.llm_cache import LLMResponseCache
 
 OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
 
+# Transient statuses worth replaying (rate limit / overloaded upstream)
+_RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+# Image calls only retry when the request was rejected before generation:
+# a 502/504 may come back after the image was already generated (and billed)
+_IMAGE_RETRY_STATUS_CODES = frozenset({429, 503})
+_IMAGE_MAX_RETRIES = 1
+_RETRY_BASE_DELAY = 1.0
+_RETRY_MAX_DELAY = 30.0
+
+# Placeholder images returned in dev mode and when image generation fails
+_DEV_PLACEHOLDER_URL: Final[str] = "data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' width='800' height='600'%3E%3Crect width='800' height='600' fill='%23e0f2fe'/%3E%3Ctext x='50%25' y='45%25' text-anchor='middle' fill='%230369a1' font-size='32' font-weight='bold'%3EM%C3%A4rchenweber%3C/text%3E%3Ctext x='50%25' y='55%25' text-anchor='middle' fill='%2306b6d4' font-size='20'%3EDEV MODE%3C/text%3E%3C/svg%3E"
+_ERROR_PLACEHOLDER_URL: Final[str] = "data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' width='800' height='600'%3E%3Crect width='800' height='600' fill='%23f3f4f6'/%3E%3Ctext x='50%25' y='50%25' text-anchor='middle' fill='%236b7280' font-size='24'%3EMärchenweber%3C/text%3E%3C/svg%3E"
+
+# Default structured-output schema for narrator responses (3 choices + characters)
+_DEFAULT_STORY_SCHEMA: Dict[str, Any] = {
+    "name": "story_response",
+    "schema": {
+        "type": "object",
+        "properties": {
+            "story_text": {
+                "type": "string",
+                "description": "The story text in German"
+            },
+            "image_prompt": {
+                "type": "string",
+                "description": "Image description in German"
+            },
+            "choice_1": {
+                "type": "string",
+                "description": "First choice in German (Ich... form)"
+            },
+            "choice_2": {
+                "type": "string",
+                "description": "Second choice in German (Ich... form)"
+            },
+            "choice_3": {
+                "type": "string",
+                "description": "Third choice in German (Ich... form)"
+            },
+            "characters_in_scene": {
+                "type": "array",
+                "description": "Characters visible in the scene",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "name": {
+                            "type": "string",
+                            "description": "Character name"
+                        },
+                        "description": {
+                            "type": "string",
+                            "description": "Visual description (for new characters only)"
+                        }
+                    },
+                    "required": ["name"],
+                    "additionalProperties": False
+                }
+            }
+        },
+        "required": ["story_text", "image_prompt", "choice_1", "choice_2", "choice_3", "characters_in_scene"],
+        "additionalProperties": False
+    }
+}
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize a request payload to compact JSON bytes."""
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# Plain-text dev stub (contains "SAFE" so it passes validate_safety)
+_DEV_STUB_TEXT: Final[str] = "[DEV MODE] SAFE - Platzhaltertext ohne LLM-Aufruf."
+
+
+def _stub_from_schema(schema: Dict[str, Any], name: str = "value") -> Any:
+    """Synthesize a minimal value matching a JSON schema (dev mode only).
+
+    Args:
+        schema: JSON schema node
+        name: Property name, used to label string stubs
+
+    Returns:
+        Stub value of the schema's type
+    """
+    if "enum" in schema:
+        return schema["enum"][0]
+
+    schema_type = schema.get("type", "string")
+    if schema_type == "object":
+        return {
+            key: _stub_from_schema(prop, key)
+            for key, prop in schema.get("properties", {}).items()
+        }
+    if schema_type == "array":
+        return [_stub_from_schema(schema.get("items", {}), name)]
+    if schema_type == "integer":
+        return schema.get("minimum", 1)
+    if schema_type == "number":
+        return float(schema.get("minimum", 1))
+    if schema_type == "boolean":
+        return False
+    return f"[DEV MODE] {name}"
+
+
+# Default response_format and its pre-serialized form (spliced into request bodies)
+_DEFAULT_RESPONSE_FORMAT: Dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": _DEFAULT_STORY_SCHEMA
+}
+_DEFAULT_RESPONSE_FORMAT_JSON = _json_dumps(_DEFAULT_RESPONSE_FORMAT)
+
+
+def _encode_payload(payload: Dict[str, Any]) -> bytes:
+    """Serialize a request payload, reusing the pre-serialized default schema.
+
+    The default story schema is the bulk of a narrator request body, so it is
+    encoded once at import and spliced in instead of re-encoded per call.
+    """
+    if payload.get("response_format") is not _DEFAULT_RESPONSE_FORMAT:
+        return _json_dumps(payload)
+
+    rest = {k: v for k, v in payload.items() if k != "response_format"}
+    return _json_dumps(rest)[:-1] + b',"response_format":' + _DEFAULT_RESPONSE_FORMAT_JSON + b"}"
+
+
+def _parse_sse_event(event_block: bytes) -> Tuple[List[str], bool]:
+    """Parse one SSE event block from a chat/completions stream.
+
+    Args:
+        event_block: Event lines (LF-separated, without the trailing blank line)
+
+    Returns:
+        Tuple of (content deltas, whether [DONE] was seen)
+
+    Raises:
+        ValueError: If the event carries an API error
+    """
+    deltas: List[str] = []
+    for line in event_block.split(b"\n"):
+        # Skip SSE comments (": OPENROUTER PROCESSING")
+        if not line.startswith(b"data:"):
+            continue
+
+        data = line[5:].strip()
+        if data == b"[DONE]":
+            return deltas, True
+
+        event = json.loads(data)
+        if "error" in event:
+            logger.error(f"API returned error mid-stream: {event['error']}")
+            raise ValueError(f"API error: {event['error'].get('message', 'Unknown error')}")
+
+        choices = event.get("choices") or []
+        if choices:
+            delta = choices[0].get("delta", {}).get("content")
+            if delta:
+                deltas.append(delta)
+
+    return deltas, False
+
 
 class LLMService:
     """Service for interacting with OpenRouter API."""
@@ -21,29 +186,122 @@ class LLMService:
             "HTTP-Referer": "https://localhost:5173",
             "X-Title": "Maerchenweber",  # ASCII only for HTTP headers
         }
-
-    async def generate_text(
+        # Long-lived client so TLS sessions and keep-alive connections are reused.
+        # The transport retries failed connection attempts; HTTP-level retries are in _post.
+        self._client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=httpx.Timeout(60.0),
+            transport=httpx.AsyncHTTPTransport(
+                retries=3,
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=50,
+                    keepalive_expiry=30.0,
+                ),
+            ),
+        )
+
+        # Caps in-flight requests so bursts stay under the provider's rate limits
+        self._sem = asyncio.Semaphore(settings.llm_max_concurrency)
+        # Image calls can hold a slot for minutes; they get their own cap so
+        # narrator/validator calls never queue behind them
+        self._image_sem = asyncio.Semaphore(settings.llm_max_image_concurrency)
+
+        # Exact-match cache for deterministic (temperature 0) prompts
+        self._cache = LLMResponseCache(
+            max_entries=settings.llm_cache_max_entries,
+            ttl_seconds=settings.llm_cache_ttl_seconds,
+        )
+
+    async def _post(
         self,
+        payload: Dict[str, Any],
+        retry_statuses: frozenset = _RETRY_STATUS_CODES,
+        max_retries: int | None = None,
+        limiter: asyncio.Semaphore | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """POST a chat/completions payload through the shared client.
+
+        Args:
+            payload: Request body
+            retry_statuses: HTTP statuses that are safe to replay for this call
+            max_retries: Retry budget (defaults to settings.llm_max_retries)
+            limiter: Concurrency limiter to hold while the request is in flight
+                (defaults to the text request limiter)
+            **kwargs: Extra httpx request options (e.g. timeout)
+
+        Returns:
+            Raw HTTP response
+        """
+        body = _encode_payload(payload)
+        if max_retries is None:
+            max_retries = settings.llm_max_retries
+        if limiter is None:
+            limiter = self._sem
+
+        for attempt in range(max_retries + 1):
+            async with limiter:
+                response = await self._client.post(OPENROUTER_API_URL, content=body, **kwargs)
+
+            if response.status_code not in retry_statuses or attempt == max_retries:
+                break
+
+            # Back off outside the semaphore so other requests can proceed
+            delay = self._retry_delay(response, attempt)
+            logger.warning(
+                "OpenRouter returned %s, retrying in %.1fs (attempt %d/%d)",
+                response.status_code, delay, attempt + 1, max_retries
+            )
+            await asyncio.sleep(delay)
+
+        logger.debug("OpenRouter response via %s", response.http_version)
+        return response
+
+    @staticmethod
+    def _retry_delay(response: httpx.Response, attempt: int) -> float:
+        """Compute the backoff before retrying a transient failure.
+
+        Honors a numeric Retry-After header, otherwise uses jittered exponential backoff.
+
+        Args:
+            response: The failed response
+            attempt: Zero-based attempt number
+
+        Returns:
+            Delay in seconds
+        """
+        try:
+            retry_after = float(response.headers.get("Retry-After", 0))
+        except ValueError:
+            retry_after = 0.0
+
+        backoff = _RETRY_BASE_DELAY * 2 ** attempt + random.uniform(0, 0.5)
+        return min(max(retry_after, backoff), _RETRY_MAX_DELAY)
+
+    async def aclose(self):
+        """Close the shared HTTP client (called on app shutdown)."""
+        await self._client.aclose()
+
+    @staticmethod
+    def _build_text_payload(
         prompt: str,
         model: str,
         sampling_params: Dict[str, Any] | None = None,
         json_mode: bool = False,
         json_schema: Dict[str, Any] | None = None,
-    ) -> str:
-        """Generate text using the OpenRouter API.
+    ) -> Dict[str, Any]:
+        """Build the chat/completions payload for a text request.
 
         Args:
             prompt: The prompt to send to the LLM
-            model: Model identifier (e.g., 'google/gemini-2.0-flash-exp:free')
-            sampling_params: Optional sampling parameters (temperature, top_p, etc.)
+            model: Model identifier
+            sampling_params: Optional sampling parameters
             json_mode: If True, request JSON output format
-            json_schema: Optional custom JSON schema (if not provided, uses default story schema)
+            json_schema: Optional custom JSON schema (defaults to the story schema)
 
         Returns:
-            Generated text response
-
-        Raises:
-            httpx.HTTPError: If the API request fails
+            Request payload dict
         """
         payload = {
             "model": model,
@@ -64,103 +322,189 @@ class LLMService:
                 }
             else:
                 # Default story schema with 3 choices + characters
-                payload["response_format"] = {
-                    "type": "json_schema",
-                    "json_schema": {
-                        "name": "story_response",
-                        "schema": {
-                            "type": "object",
-                            "properties": {
-                                "story_text": {
-                                    "type": "string",
-                                    "description": "The story text in German"
-                                },
-                                "image_prompt": {
-                                    "type": "string",
-                                    "description": "Image description in German"
-                                },
-                                "choice_1": {
-                                    "type": "string",
-                                    "description": "First choice in German (Ich... form)"
-                                },
-                                "choice_2": {
-                                    "type": "string",
-                                    "description": "Second choice in German (Ich... form)"
-                                },
-                                "choice_3": {
-                                    "type": "string",
-                                    "description": "Third choice in German (Ich... form)"
-                                },
-                                "characters_in_scene": {
-                                    "type": "array",
-                                    "description": "Characters visible in the scene",
-                                    "items": {
-                                        "type": "object",
-                                        "properties": {
-                                            "name": {
-                                                "type": "string",
-                                                "description": "Character name"
-                                            },
-                                            "description": {
-                                                "type": "string",
-                                                "description": "Visual description (for new characters only)"
-                                            }
-                                        },
-                                        "required": ["name"],
-                                        "additionalProperties": False
-                                    }
-                                }
-                            },
-                            "required": ["story_text", "image_prompt", "choice_1", "choice_2", "choice_3", "characters_in_scene"],
-                            "additionalProperties": False
-                        }
-                    }
-                }
-
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            try:
-                logger.info(f"Calling OpenRouter API with model: {model}")
-                response = await client.post(
-                    OPENROUTER_API_URL,
-                    headers=self.headers,
-                    json=payload,
-                )
-                response.raise_for_status()
-                result = response.json()
-
-                logger.info(f"API response status: {response.status_code}")
-                logger.info(f"API response keys: {result.keys()}")
+                payload["response_format"] = _DEFAULT_RESPONSE_FORMAT
 
-                # Check for errors in response
-                if "error" in result:
-                    logger.error(f"API returned error: {result['error']}")
-                    raise ValueError(f"API error: {result['error'].get('message', 'Unknown error')}")
+        return payload
 
-                # Extract the content from the response
-                if "choices" in result and len(result["choices"]) > 0:
-                    content = result["choices"][0]["message"]["content"]
-                    logger.info(f"Extracted content (first 100 chars): {content[:100] if content else 'EMPTY/NULL'}")
+    async def generate_text(
+        self,
+        prompt: str,
+        model: str,
+        sampling_params: Dict[str, Any] | None = None,
+        json_mode: bool = False,
+        json_schema: Dict[str, Any] | None = None,
+        stream: bool = False,
+    ) -> str:
+        """Generate text using the OpenRouter API.
 
-                    if not content:
-                        logger.error(f"Content is empty! Full response: {result}")
-                        raise ValueError("Empty content in API response")
+        Args:
+            prompt: The prompt to send to the LLM
+            model: Model identifier (e.g., 'google/gemini-2.0-flash-exp:free')
+            sampling_params: Optional sampling parameters (temperature, top_p, etc.)
+            json_mode: If True, request JSON output format
+            json_schema: Optional custom JSON schema (if not provided, uses default story schema)
+            stream: If True, receive the response via SSE and assemble it locally
 
-                    return content.strip()
-                else:
-                    logger.error(f"No choices in response. Full response: {result}")
-                    raise ValueError("No choices in API response")
+        Returns:
+            Generated text response
 
+        Raises:
+            httpx.HTTPError: If the API request fails
+        """
+        # DEV MODE: Skip the LLM call and return a stub matching the requested format
+        if settings.dev_mode and settings.dev_stub_text:
+            logger.info("🚧 [DEV MODE] Skipping text generation, returning stub")
+            if not json_mode:
+                return _DEV_STUB_TEXT
+            schema = (json_schema or _DEFAULT_STORY_SCHEMA)["schema"]
+            return _json_dumps(_stub_from_schema(schema)).decode("utf-8")
+
+        # Only explicitly deterministic requests are safe to serve from cache
+        # (an unset temperature means the provider default, which is 1.0)
+        cacheable = (sampling_params or {}).get("temperature") == 0
+        if cacheable:
+            cache_key = LLMResponseCache.make_key(model, prompt, sampling_params, json_schema, json_mode)
+            cached = await self._cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"LLM cache hit for model: {model}")
+                return cached
+
+        if stream:
+            # Collect deltas and join once [DONE] arrived (avoids O(n^2) string concatenation);
+            # generate_text_stream raises if the stream ends without [DONE]
+            chunks: List[str] = []
+            try:
+                async for delta in self.generate_text_stream(
+                    prompt, model, sampling_params, json_mode, json_schema
+                ):
+                    chunks.append(delta)
             except httpx.HTTPError as e:
+                error_response = e.response if isinstance(e, httpx.HTTPStatusError) else None
                 logger.error(f"OpenRouter API HTTP error: {str(e)}")
-                logger.error(f"Response status: {response.status_code if 'response' in locals() else 'N/A'}")
-                logger.error(f"Response text: {response.text[:500] if 'response' in locals() else 'N/A'}")
+                logger.error(f"Response status: {error_response.status_code if error_response is not None else 'N/A'}")
+                logger.error(f"Response text: {error_response.text[:500] if error_response is not None else 'N/A'}")
                 raise
-            except (KeyError, IndexError, ValueError) as e:
-                logger.error(f"Failed to parse API response: {type(e).__name__}")
-                logger.error(f"Error details: {str(e)}")
-                if 'result' in locals():
-                    logger.error(f"Response structure: {result}")
-                raise ValueError("Invalid API response format")
+
+            content = "".join(chunks).strip()
+            if not content:
+                logger.error(f"Streamed content is empty for model: {model}")
+                raise ValueError("Empty content in API response")
+
+            if cacheable:
+                await self._cache.set(cache_key, content)
+            return content
+
+        payload = self._build_text_payload(prompt, model, sampling_params, json_mode, json_schema)
+        response: httpx.Response | None = None
+
+        try:
+            logger.info("Calling OpenRouter API with model: %s", model)
+            response = await self._post(payload)
+            response.raise_for_status()
+            # Decode and validate in one pass (ValidationError is a ValueError)
+            result = OpenRouterResponse.model_validate_json(response.content)
+
+            logger.debug("API response status: %s", response.status_code)
+
+            # Check for errors in response
+            if result.error:
+                logger.error(f"API returned error: {result.error}")
+                raise ValueError(f"API error: {result.error.message}")
+
+            # Extract the content from the response
+            if result.choices:
+                content = result.choices[0].message.content
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Extracted content (first 100 chars): %s", content[:100] if content else "EMPTY/NULL")
+
+                if not content:
+                    logger.error(f"Content is empty! Full response: {result}")
+                    raise ValueError("Empty content in API response")
+
+                content = content.strip()
+                if cacheable:
+                    await self._cache.set(cache_key, content)
+                return content
+            else:
+                logger.error(f"No choices in response. Full response: {result}")
+                raise ValueError("No choices in API response")
+
+        except httpx.HTTPError as e:
+            logger.error(f"OpenRouter API HTTP error: {str(e)}")
+            logger.error(f"Response status: {response.status_code if response is not None else 'N/A'}")
+            logger.error(f"Response text: {response.text[:500] if response is not None else 'N/A'}")
+            raise
+        except (KeyError, IndexError, ValueError) as e:
+            logger.error(f"Failed to parse API response: {type(e).__name__}")
+            logger.error(f"Error details: {str(e)}")
+            raise ValueError("Invalid API response format")
+
+    async def generate_text_stream(
+        self,
+        prompt: str,
+        model: str,
+        sampling_params: Dict[str, Any] | None = None,
+        json_mode: bool = False,
+        json_schema: Dict[str, Any] | None = None,
+    ) -> AsyncIterator[str]:
+        """Stream generated text from the OpenRouter API as it arrives (SSE).
+
+        Args:
+            prompt: The prompt to send to the LLM
+            model: Model identifier
+            sampling_params: Optional sampling parameters (temperature, top_p, etc.)
+            json_mode: If True, request JSON output format
+            json_schema: Optional custom JSON schema (if not provided, uses default story schema)
+
+        Yields:
+            Content deltas in arrival order
+
+        Raises:
+            httpx.HTTPError: If the API request fails
+            ValueError: If the stream reports an error or ends before [DONE]
+        """
+        payload = self._build_text_payload(prompt, model, sampling_params, json_mode, json_schema)
+        payload["stream"] = True
+
+        logger.info("Streaming from OpenRouter API with model: %s", model)
+        async with self._sem:
+            async with self._client.stream(
+                "POST",
+                OPENROUTER_API_URL,
+                content=_encode_payload(payload),
+            ) as response:
+                if response.is_error:
+                    await response.aread()  # Load the error body so callers can log it
+                response.raise_for_status()
+
+                # Split raw bytes on event boundaries (bytes.find is a memchr scan)
+                # and decode only the data payloads, instead of str-decoding every line
+                buf = bytearray()
+                async for chunk in response.aiter_bytes(65536):
+                    buf += chunk
+                    if b"\r" in buf:
+                        # Normalize CRLF separators; a trailing lone \r waits for its \n
+                        buf = bytearray(buf.replace(b"\r\n", b"\n"))
+
+                    while (end := buf.find(b"\n\n")) != -1:
+                        deltas, done = _parse_sse_event(bytes(buf[:end]))
+                        del buf[:end + 2]
+                        for delta in deltas:
+                            yield delta
+                        if done:
+                            return
+
+                # A final event may arrive without the trailing blank line
+                if buf.strip():
+                    deltas, done = _parse_sse_event(bytes(buf))
+                    for delta in deltas:
+                        yield delta
+                    if done:
+                        return
+
+                # [DONE] returns above; reaching here means the body was cut off
+                logger.error(f"Stream ended before [DONE] for model: {model}")
+                raise ValueError("Stream ended before [DONE]")
 
     async def generate_image(
         self,
@@ -188,7 +532,7 @@ class LLMService:
         # DEV MODE: Skip image generation and return placeholder
         if settings.dev_mode:
             logger.info("🚧 [DEV MODE] Skipping image generation, returning placeholder")
-            return "data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' width='800' height='600'%3E%3Crect width='800' height='600' fill='%23e0f2fe'/%3E%3Ctext x='50%25' y='45%25' text-anchor='middle' fill='%230369a1' font-size='32' font-weight='bold'%3EM%C3%A4rchenweber%3C/text%3E%3Ctext x='50%25' y='55%25' text-anchor='middle' fill='%2306b6d4' font-size='20'%3EDEV MODE%3C/text%3E%3C/svg%3E"
+            return _DEV_PLACEHOLDER_URL
 
         # Build the content array for multimodal input
         # OpenRouter docs: send text first, then images to avoid parsing issues
@@ -223,76 +567,95 @@ class LLMService:
             "modalities": ["image", "text"],
             "image_config": {"aspect_ratio": aspect_ratio},
         }
+        response: httpx.Response | None = None
+
+        try:
+            logger.info(
+                "🌐 [API CALL] Calling OpenRouter image generation API (model=%s, prompt=%d chars, aspect_ratio=%s, timeout=120s)",
+                model, len(prompt), aspect_ratio
+            )
+
+            response = await self._post(
+                payload,
+                retry_statuses=_IMAGE_RETRY_STATUS_CODES,
+                max_retries=_IMAGE_MAX_RETRIES,
+                limiter=self._image_sem,
+                timeout=120.0,
+            )
+
+            logger.info("📥 [API RESPONSE] Status: %s", response.status_code)
+
+            if response.status_code != 200:
+                logger.error(f"❌ [API ERROR] Non-200 status code: {response.status_code}")
+                logger.error(f"  - Response text: {response.text[:1000]}")
+
+            response.raise_for_status()
+            result = OpenRouterResponse.model_validate_json(response.content)
+
+            # Check for API errors in response
+            if result.error:
+                logger.error(f"❌ [API ERROR] Error in response: {result.error}")
+                raise ValueError(f"OpenRouter API error: {result.error.message}")
+
+            # Extract image URL from response
+            if result.choices:
+                message = result.choices[0].message
+
+                # Check for images in the response
+                if message.images:
+                    image_url = message.images[0].image_url.url
+                    if logger.isEnabledFor(logging.INFO):
+                        url_type = "data URL" if image_url.startswith("data:") else "hosted URL"
+                        logger.info("✅ [API RESPONSE] Image URL received (%s): %s...", url_type, image_url[:100])
+                    return image_url
+                else:
+                    logger.warning("⚠️ [API RESPONSE] No images in API response, returning placeholder")
+                    logger.warning(f"  - Message content: {message}")
+                    return _ERROR_PLACEHOLDER_URL
+            else:
+                logger.error(f"❌ [API RESPONSE] No choices in API response")
+                logger.error(f"  - Full response: {result}")
+                raise ValueError("No choices in API response")
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            try:
-                logger.info(f"🌐 [API CALL] Calling OpenRouter image generation API...")
-                logger.info(f"  - Model: {model}")
-                logger.info(f"  - Prompt length: {len(prompt)} chars")
-                logger.info(f"  - Aspect ratio: {aspect_ratio}")
-                logger.info(f"  - Timeout: 120s")
-
-                response = await client.post(
-                    OPENROUTER_API_URL,
-                    headers=self.headers,
-                    json=payload,
-                )
-
-                logger.info(f"📥 [API RESPONSE] Status: {response.status_code}")
+        except (httpx.HTTPError, KeyError, IndexError, ValueError) as e:
+            return self._handle_image_failure(e, model, response)
 
-                if response.status_code != 200:
-                    logger.error(f"❌ [API ERROR] Non-200 status code: {response.status_code}")
-                    logger.error(f"  - Response text: {response.text[:1000]}")
+    @staticmethod
+    def _handle_image_failure(
+        exc: Exception,
+        model: str,
+        response: httpx.Response | None,
+    ) -> str:
+        """Log an image generation failure and pick the fallback.
 
-                response.raise_for_status()
-                result = response.json()
+        Args:
+            exc: The exception raised while generating the image
+            model: Model identifier that was called
+            response: HTTP response, if one was received
 
-                logger.info(f"📦 [API RESPONSE] Response keys: {list(result.keys())}")
+        Returns:
+            Placeholder image URL
 
-                # Check for API errors in response
-                if "error" in result:
-                    logger.error(f"❌ [API ERROR] Error in response: {result['error']}")
-                    raise ValueError(f"OpenRouter API error: {result['error']}")
+        Raises:
+            ValueError: On timeout (the model is likely unavailable or unsuitable)
+        """
+        if isinstance(exc, httpx.TimeoutException):
+            logger.error(f"❌ [API TIMEOUT] Image generation timed out after 120s")
+            logger.error(f"  - Model: {model}")
+            logger.error(f"  - This may indicate the model is slow, unavailable, or doesn't support image generation")
+            raise ValueError(f"Image generation timed out. Model '{model}' may not support image generation or is overloaded.")
+
+        if isinstance(exc, httpx.HTTPError):
+            logger.error(f"❌ [API ERROR] OpenRouter image generation error: {exc}")
+        else:
+            logger.error(f"Failed to parse image API response: {exc}")
 
-                # Extract image URL from response
-                if "choices" in result and len(result["choices"]) > 0:
-                    message = result["choices"][0]["message"]
-                    logger.info(f"📦 [API RESPONSE] Message keys: {list(message.keys())}")
+        if response is not None:
+            logger.error(f"Response status: {response.status_code}")
+            logger.error(f"Response text: {response.text[:500]}")
 
-                    # Check for images in the response
-                    if "images" in message and len(message["images"]) > 0:
-                        image_data = message["images"][0]
-                        image_url = image_data["image_url"]["url"]
-                        url_type = "data URL" if image_url.startswith("data:") else "hosted URL"
-                        url_preview = image_url[:100] if len(image_url) > 100 else image_url
-                        logger.info(f"✅ [API RESPONSE] Image URL received ({url_type}): {url_preview}...")
-                        return image_url
-                    else:
-                        logger.warning("⚠️ [API RESPONSE] No images in API response, returning placeholder")
-                        logger.warning(f"  - Message content: {message}")
-                        return "data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' width='800' height='600'%3E%3Crect width='800' height='600' fill='%23f3f4f6'/%3E%3Ctext x='50%25' y='50%25' text-anchor='middle' fill='%236b7280' font-size='24'%3EMärchenweber%3C/text%3E%3C/svg%3E"
-                else:
-                    logger.error(f"❌ [API RESPONSE] No choices in API response")
-                    logger.error(f"  - Full response: {result}")
-                    raise ValueError("No choices in API response")
-
-            except httpx.TimeoutException as e:
-                logger.error(f"❌ [API TIMEOUT] Image generation timed out after 120s")
-                logger.error(f"  - Model: {model}")
-                logger.error(f"  - This may indicate the model is slow, unavailable, or doesn't support image generation")
-                raise ValueError(f"Image generation timed out. Model '{model}' may not support image generation or is overloaded.")
-            except httpx.HTTPError as e:
-                logger.error(f"❌ [API ERROR] OpenRouter image generation error: {e}")
-                if 'response' in locals():
-                    logger.error(f"Response status: {response.status_code}")
-                    logger.error(f"Response text: {response.text[:500]}")
-                # Return placeholder image on error
-                return "data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' width='800' height='600'%3E%3Crect width='800' height='600' fill='%23f3f4f6'/%3E%3Ctext x='50%25' y='50%25' text-anchor='middle' fill='%236b7280' font-size='24'%3EMärchenweber%3C/text%3E%3C/svg%3E"
-            except (KeyError, IndexError, ValueError) as e:
-                logger.error(f"Failed to parse image API response: {e}")
-                if 'result' in locals():
-                    logger.error(f"API response structure: {result}")
-                return "data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' width='800' height='600'%3E%3Crect width='800' height='600' fill='%23f3f4f6'/%3E%3Ctext x='50%25' y='50%25' text-anchor='middle' fill='%236b7280' font-size='24'%3EMärchenweber%3C/text%3E%3C/svg%3E"
+        # Return placeholder image on error
+        return _ERROR_PLACEHOLDER_URL
 
     async def generate_parallel(
         self,
@@ -306,47 +669,75 @@ class LLMService:
         Returns:
             List of generated text responses in the same order as prompts
         """
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            tasks = []
-            for item in prompts:
-                payload = {
-                    "model": item["model"],
-                    "messages": [{"role": "user", "content": item["prompt"]}],
-                }
-                if "sampling_params" in item:
-                    payload.update(item["sampling_params"])
-
-                task = client.post(
-                    OPENROUTER_API_URL,
-                    headers=self.headers,
-                    json=payload,
+        # Identical requests to models that support "n" share one multi-completion call
+        groups: Dict[str, List[int]] = {}
+        for idx, item in enumerate(prompts):
+            if item["model"] in settings.llm_multi_completion_models:
+                group_key = json.dumps(
+                    [item["model"], item["prompt"], item.get("sampling_params")],
+                    sort_keys=True,
                 )
-                tasks.append(task)
+            else:
+                group_key = str(idx)
+            groups.setdefault(group_key, []).append(idx)
+
+        group_indices = list(groups.values())
+        coros = []
+        for indices in group_indices:
+            item = prompts[indices[0]]
+            payload = {
+                "model": item["model"],
+                "messages": [{"role": "user", "content": item["prompt"]}],
+            }
+            if "sampling_params" in item:
+                payload.update(item["sampling_params"])
+            if len(indices) > 1:
+                payload["n"] = len(indices)
+
+            # Not awaited here - gathered below so all requests run concurrently
+            coros.append(self._post(payload))
+
+        # Execute all requests in parallel
+        responses = await asyncio.gather(*coros, return_exceptions=True)
+
+        results = [""] * len(prompts)
+        for indices, response in zip(group_indices, responses):
+            if isinstance(response, Exception):
+                logger.error(f"Parallel request failed: {response}")
+                continue
+
+            try:
+                response.raise_for_status()
+                result = OpenRouterResponse.model_validate_json(response.content)
+                # Map returned choices back to their input positions
+                for idx, choice in zip(indices, result.choices):
+                    content = choice.message.content
+                    results[idx] = content.strip() if content else ""
+            except Exception as e:
+                logger.error(f"Failed to process parallel response: {e}")
 
-            # Execute all requests in parallel
-            responses = await httpx.AsyncClient().gather(*tasks)
+        return results
 
-            results = []
-            for response in responses:
-                try:
-                    response.raise_for_status()
-                    result = response.json()
-                    if "choices" in result and len(result["choices"]) > 0:
-                        content = result["choices"][0]["message"]["content"]
-                        results.append(content.strip())
-                    else:
-                        results.append("")
-                except Exception as e:
-                    logger.error(f"Failed to process parallel response: {e}")
-                    results.append("")
 
-            return results
+# Global LLM service instance (shares one HTTP connection pool)
+_llm_service: LLMService | None = None
 
 
 def get_llm_service() -> LLMService:
-    """Get an instance of the LLM service.
+    """Get or create the global LLM service instance.
 
     Returns:
         LLMService instance
     """
-    return LLMService()
+    global _llm_service
+    if _llm_service is None:
+        _llm_service = LLMService()
+    return _llm_service
+
+
+async def close_llm_service():
+    """Close the global LLM service's HTTP client."""
+    global _llm_service
+    if _llm_service:
+        await _llm_service.aclose()
+        _llm_service = None
@@ -2,10 +2,10 @@
 
 from app.logger import logger
 from datetime import datetime
-from typing import Optional, Dict, Any
-from bson import ObjectId
+from typing import Optional, Dict, Any, List, AsyncIterator
+from pymongo import ReturnDocument
 
-from app.database import get_database
+from app.database import get_database, to_object_id
 
 
 
@@ -37,6 +37,7 @@ class SessionManager:
         """
         logger.info(f"Creating session for user {user_id}")
 
+        now = datetime.utcnow()
         session_doc = {
             "userId": user_id,
             "gameType": "maerchenweber",
@@ -49,8 +50,8 @@ class SessionManager:
             "summary": "",
             "score": 0,
             "round": 0,
-            "createdAt": datetime.utcnow(),
-            "lastUpdated": datetime.utcnow(),
+            "createdAt": now,
+            "lastUpdated": now,
             "style_guide": "",
             "character_registry": [],
             "pending_image": None
@@ -61,11 +62,16 @@ class SessionManager:
         logger.info(f"Created session {session_id} with status 'generating'")
         return session_id
 
-    async def load_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+    async def load_session(
+        self,
+        session_id: str,
+        fields: Optional[List[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
         """Load a session from the database.
 
         Args:
             session_id: The session ID to load
+            fields: Optional list of fields to fetch (projection); defaults to the whole document
 
         Returns:
             Session document or None if not found
@@ -73,12 +79,13 @@ class SessionManager:
         Raises:
             ValueError: If session uses old format without turns[]
         """
-        session = await self.collection.find_one({"_id": ObjectId(session_id)})
+        projection = {field: 1 for field in fields} if fields else None
+        session = await self.collection.find_one({"_id": to_object_id(session_id)}, projection)
 
         if not session:
             return None
 
-        if "turns" not in session:
+        if (fields is None or "turns" in fields) and "turns" not in session:
             raise ValueError(
                 f"Session {session_id} uses outdated format. "
                 "Please manually migrate in MongoDB or start a new story."
@@ -86,45 +93,103 @@ class SessionManager:
 
         return session
 
-    async def recover_incomplete_turns(self, session_id: str) -> bool:
+    async def session_exists(self, session_id: str) -> bool:
+        """Check whether a session exists (fetches only the _id).
+
+        Args:
+            session_id: The session ID
+
+        Returns:
+            True if the session exists
+        """
+        return await self.collection.find_one({"_id": to_object_id(session_id)}, {"_id": 1}) is not None
+
+    async def stream_turns(self, session_id: str, batch_size: int = 16) -> AsyncIterator[Dict[str, Any]]:
+        """Yield a session's turns one by one, fetched from the server in batches.
+
+        Args:
+            session_id: The session ID
+            batch_size: Number of turns per cursor batch
+
+        Yields:
+            Turn documents in round order
+        """
+        cursor = self.collection.aggregate(
+            [
+                {"$match": {"_id": to_object_id(session_id)}},
+                {"$unwind": "$turns"},
+                {"$replaceRoot": {"newRoot": "$turns"}},
+            ],
+            batchSize=batch_size,
+        )
+        async for turn in cursor:
+            yield turn
+
+    async def recover_incomplete_turns(
+        self,
+        session_id: str,
+        session: Optional[Dict[str, Any]] = None,
+    ) -> bool:
         """Remove any incomplete turns on session load for error recovery.
 
         Args:
             session_id: The session ID to recover
+            session: Already-loaded session document; if it has no incomplete
+                turns, no database call is made
 
         Returns:
             True if recovery was needed, False otherwise
         """
-        session = await self.collection.find_one({"_id": ObjectId(session_id)})
-        if not session:
-            return False
-
-        turns = session.get("turns", [])
-        if not turns:
+        if session is not None and all(t.get("completed_at") for t in session.get("turns", [])):
             return False
 
-        complete_turns = [t for t in turns if t.get("completed_at")]
-
-        if len(complete_turns) < len(turns):
-            logger.warning(
-                f"Session {session_id}: Recovering from incomplete state. "
-                f"Removing {len(turns) - len(complete_turns)} incomplete turn(s)"
-            )
-
-            await self.collection.update_one(
-                {"_id": ObjectId(session_id)},
+        # One round trip: only sessions holding an incomplete turn match, and the
+        # pipeline filters the turns server-side. The pre-image (completed_at only)
+        # is returned to report how many turns were dropped.
+        # $filter is used rather than $pull: update operators can't be mixed into a
+        # pipeline, and the follow-up $size needs the filtered array in the same
+        # update. Either way the turns array never travels over the wire.
+        before = await self.collection.find_one_and_update(
+            {
+                "_id": to_object_id(session_id),
+                "turns": {"$elemMatch": {"completed_at": None}},
+            },
+            [
                 {
                     "$set": {
-                        "turns": complete_turns,
-                        "generation_status": "ready" if complete_turns else "error",
-                        "round": len(complete_turns),
-                        "lastUpdated": datetime.utcnow()
+                        "turns": {
+                            "$filter": {
+                                "input": "$turns",
+                                "as": "t",
+                                "cond": {"$ne": [{"$ifNull": ["$$t.completed_at", None]}, None]},
+                            }
+                        }
                     }
-                }
-            )
-            return True
+                },
+                {
+                    "$set": {
+                        "round": {"$size": "$turns"},
+                        "generation_status": {
+                            "$cond": [{"$gt": [{"$size": "$turns"}, 0]}, "ready", "error"]
+                        },
+                        "lastUpdated": "$$NOW",
+                    }
+                },
+            ],
+            projection={"turns.completed_at": 1},
+            return_document=ReturnDocument.BEFORE,
+        )
 
-        return False
+        if not before:
+            return False
+
+        turns = before.get("turns", [])
+        removed = sum(1 for t in turns if not t.get("completed_at"))
+        logger.warning(
+            f"Session {session_id}: Recovering from incomplete state. "
+            f"Removed {removed} incomplete turn(s)"
+        )
+        return True
 
     async def mark_error(self, session_id: str, error_message: str):
         """Mark a session as having an error.
@@ -134,17 +199,29 @@ class SessionManager:
             error_message: Error message to store
         """
         await self.collection.update_one(
-            {"_id": ObjectId(session_id)},
-            {
-                "$set": {
-                    "generation_status": "error",
-                    "generation_error": error_message,
-                    "lastUpdated": datetime.utcnow()
+            {"_id": to_object_id(session_id)},
+            [
+                {
+                    "$set": {
+                        "generation_status": "error",
+                        "generation_error": {"$literal": error_message},
+                        "lastUpdated": "$$NOW"
+                    }
                 }
-            }
+            ]
         )
 
 
+_session_manager: SessionManager | None = None
+
+
 def get_session_manager() -> SessionManager:
-    """Get an instance of the session manager."""
-    return SessionManager()
+    """Get or create the global session manager instance.
+
+    Returns:
+        SessionManager instance
+    """
+    global _session_manager
+    if _session_manager is None:
+        _session_manager = SessionManager()
+    return _session_manager
@@ -1,9 +1,13 @@
 """Story generation service for Märchenweber - handles narrator, validation, fun nuggets."""
 
+import asyncio
+import re
 from app.logger import logger
-from typing import Any
+from typing import Any, Dict
 
+from app.config import settings
 from app.services.config_loader import get_config_loader
+from app.services.llm_cache import LLMResponseCache
 from app.services.llm_service import get_llm_service
 
 
@@ -15,12 +19,84 @@ class StoryGenerator:
         """Initialize the story generator."""
         self.config = get_config_loader()
         self.llm = get_llm_service()
+        self.cache = LLMResponseCache(
+            max_entries=settings.llm_cache_max_entries,
+            ttl_seconds=settings.llm_cache_ttl_seconds,
+        )
+        # In-flight calls by cache key, so concurrent identical requests share one LLM call
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        # Local pre-check for the validate_safety fast path (None if no blocklist is configured)
+        blocklist = self.config.get_safety_blocklist()
+        self._unsafe_re = (
+            re.compile(r"\b(?:" + "|".join(map(re.escape, blocklist)) + r")\b", re.IGNORECASE)
+            if blocklist else None
+        )
+        self._safety_fast_path = self.config.get_game_mechanic("safety_fast_path", False)
+        self._safety_fast_path_max_chars = self.config.get_game_mechanic("safety_fast_path_max_chars", 3000)
+
+    async def _generate_cached(
+        self,
+        prompt: str,
+        model: str,
+        params: Dict[str, Any],
+        fresh: bool = False,
+    ) -> str:
+        """Call the LLM, serving exact repeats of (prompt, model, params) from cache.
+
+        Unlike the LLMService cache this also covers non-zero temperatures: a
+        repeated style guide/validation/nugget request reuses the earlier answer.
+        Identical requests arriving while a call is still running await that call.
+
+        Args:
+            prompt: Rendered prompt
+            model: Model identifier
+            params: Sampling parameters
+            fresh: If True, skip the cache lookup (result is still stored)
+
+        Returns:
+            Generated text
+        """
+        key = LLMResponseCache.make_key(model, prompt, params)
+        if not fresh:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                return cached
+
+            task = self._inflight.get(key)
+            if task is not None:
+                # Shielded so one cancelled waiter doesn't cancel the shared call
+                return await asyncio.shield(task)
+
+        task = asyncio.create_task(self._generate_and_store(key, prompt, model, params))
+        self._inflight[key] = task
+        task.add_done_callback(
+            lambda t: self._inflight.pop(key) if self._inflight.get(key) is t else None
+        )
+        return await asyncio.shield(task)
+
+    async def _generate_and_store(
+        self,
+        key: str,
+        prompt: str,
+        model: str,
+        params: Dict[str, Any],
+    ) -> str:
+        """Call the LLM and cache the result under key."""
+        result = await self.llm.generate_text(
+            prompt=prompt,
+            model=model,
+            sampling_params=params
+        )
+        await self.cache.set(key, result)
+        return result
 
     async def generate_style_guide(
         self,
         character_name: str,
         character_description: str,
-        story_theme: str
+        story_theme: str,
+        fresh: bool = False
     ) -> str:
         """Generate a visual style guide for consistent art style.
 
@@ -28,6 +104,7 @@ class StoryGenerator:
             character_name: Character name
             character_description: Character description
             story_theme: Story theme
+            fresh: If True, bypass the output cache
 
         Returns:
             Style guide (1-2 sentences in English)
@@ -43,11 +120,7 @@ class StoryGenerator:
             model = self.config.get_model("style_guide_generator")
             params = self.config.get_sampling_params("style_guide_generator")
 
-            result = await self.llm.generate_text(
-                prompt=prompt,
-                model=model,
-                sampling_params=params
-            )
+            result = await self._generate_cached(prompt, model, params, fresh=fresh)
 
             return result.strip()
 
@@ -55,15 +128,25 @@ class StoryGenerator:
             logger.error(f"Error generating style guide: {e}")
             return "Watercolor fairy tale style with soft pastel colors, dreamy magical atmosphere"
 
-    async def validate_safety(self, german_text: str) -> bool:
+    async def validate_safety(self, german_text: str, fresh: bool = False) -> bool:
         """Validate that the text is appropriate for a 7-year-old.
 
         Args:
             german_text: The German text to validate
+            fresh: If True, bypass the output cache
 
         Returns:
             True if safe, False if unsafe
         """
+        # Optional fast path: short texts without a blocklist hit skip the LLM.
+        # A hit is only a gray-zone signal ("rot wie Blut") - the LLM decides.
+        if self._safety_fast_path and self._unsafe_re is not None:
+            match = self._unsafe_re.search(german_text)
+            if match:
+                logger.info(f"Safety blocklist hit '{match.group(0)}' - asking validator")
+            elif len(german_text) < self._safety_fast_path_max_chars:
+                return True
+
         try:
             validator_prompt = self.config.get_prompt(
                 "validator",
@@ -73,23 +156,24 @@ class StoryGenerator:
             validator_model = self.config.get_model("validator")
             validator_params = self.config.get_sampling_params("validator")
 
-            response = await self.llm.generate_text(
-                prompt=validator_prompt,
-                model=validator_model,
-                sampling_params=validator_params,
+            response = await self._generate_cached(
+                validator_prompt, validator_model, validator_params, fresh=fresh
             )
 
-            return "SAFE" in response.upper()
+            # "SAFE" is a substring of "UNSAFE", so check the negative first
+            verdict = response.upper()
+            return "UNSAFE" not in verdict and "SAFE" in verdict
 
         except Exception as e:
             logger.error(f"Safety validation error: {e}")
             return True
 
-    async def generate_fun_nugget(self, current_story: str) -> str:
+    async def generate_fun_nugget(self, current_story: str, fresh: bool = False) -> str:
         """Generate a fun fact or teaser related to the current story.
 
         Args:
             current_story: The current story context
+            fresh: If True, bypass the output cache
 
         Returns:
             Fun nugget text (1 sentence)
@@ -103,10 +187,8 @@ class StoryGenerator:
             fun_nugget_model = self.config.get_model("fun_nugget_generator")
             fun_nugget_params = self.config.get_sampling_params("fun_nugget_generator")
 
-            fun_nugget = await self.llm.generate_text(
-                prompt=fun_nugget_prompt,
-                model=fun_nugget_model,
-                sampling_params=fun_nugget_params,
+            fun_nugget = await self._generate_cached(
+                fun_nugget_prompt, fun_nugget_model, fun_nugget_params, fresh=fresh
             )
 
             logger.info(f"Generated fun nugget: {fun_nugget[:80]}...")
@@ -117,6 +199,16 @@ class StoryGenerator:
             return "Wusstest du? Jede Geschichte, die du erlebst, ist einzigartig und magisch!"
 
 
+_story_generator: StoryGenerator | None = None
+
+
 def get_story_generator() -> StoryGenerator:
-    """Get an instance of the story generator."""
-    return StoryGenerator()
+    """Get or create the global story generator instance.
+
+    Returns:
+        StoryGenerator instance
+    """
+    global _story_generator
+    if _story_generator is None:
+        _story_generator = StoryGenerator()
+    return _story_generator
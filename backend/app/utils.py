@@ -2,7 +2,7 @@
 
 import time
 from app.logger import logger
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from contextlib import contextmanager
 
 
@@ -11,43 +11,46 @@ class StepTimer:
     """Track timing for each step in the pipeline."""
 
     def __init__(self):
-        self.steps: List[Dict[str, float]] = []
+        # (name, duration_ns, error message or None); dicts are built in get_summary()
+        self.steps: List[Tuple[str, int, Optional[str]]] = []
         self.current_step: Optional[str] = None
-        self.step_start: Optional[float] = None
+        self.step_start: Optional[int] = None
 
     @contextmanager
     def step(self, name: str):
         """Context manager to time a step."""
         self.current_step = name
-        self.step_start = time.time()
-        logger.info(f"[STEP START] {name}")
+        logger.info("[STEP START] %s", name)
+        self.step_start = time.perf_counter_ns()
 
         try:
             yield
         except Exception as e:
-            duration = time.time() - self.step_start
-            self.steps.append({
-                "name": name,
-                "duration_ms": round(duration * 1000, 2),
-                "status": "error",
-                "error": str(e)
-            })
-            logger.error(f"[STEP ERROR] {name} failed after {duration:.2f}s: {e}")
+            duration_ns = time.perf_counter_ns() - self.step_start
+            self.steps.append((name, duration_ns, str(e)))
+            logger.error("[STEP ERROR] %s failed after %.2fs: %s", name, duration_ns / 1e9, e)
             raise
         else:
-            duration = time.time() - self.step_start
-            self.steps.append({
-                "name": name,
-                "duration_ms": round(duration * 1000, 2),
-                "status": "success"
-            })
-            logger.info(f"[STEP COMPLETE] {name} ({duration:.2f}s)")
+            duration_ns = time.perf_counter_ns() - self.step_start
+            self.steps.append((name, duration_ns, None))
+            logger.info("[STEP COMPLETE] %s (%.2fs)", name, duration_ns / 1e9)
 
     def get_summary(self) -> Dict:
         """Get timing summary."""
-        total_ms = sum(s["duration_ms"] for s in self.steps)
+        steps = []
+        for name, duration_ns, error in self.steps:
+            step = {
+                "name": name,
+                "duration_ms": round(duration_ns / 1e6, 2),
+                "status": "success" if error is None else "error",
+            }
+            if error is not None:
+                step["error"] = error
+            steps.append(step)
+
+        total_ns = sum(duration_ns for _, duration_ns, _ in self.steps)
         return {
-            "steps": self.steps,
-            "total_ms": round(total_ms, 2),
+            "steps": steps,
+            "total_ms": round(total_ns / 1e6, 2),
             "step_count": len(self.steps)
         }
@@ -8,50 +8,80 @@ from pathlib import Path
 from motor.motor_asyncio import AsyncIOMotorClient
 import asyncio
 from bson import ObjectId
+from pymongo import UpdateOne
 from datetime import datetime
 
 from dotenv import load_dotenv
 load_dotenv(Path(__file__).parent.parent / '.env')
 
+DB_NAME = 'humanbenchmark'
 
-async def find_user(username: str):
-    """Find user by username across all databases."""
-    uri = os.getenv('MONGODB_URI')
-    client = AsyncIOMotorClient(uri)
+# One client for the whole run (connect + TLS + topology discovery only once)
+_client: AsyncIOMotorClient | None = None
 
-    # Check common databases
-    databases = ['humanbenchmark', 'myFirstDatabase', 'test']
 
-    for db_name in databases:
-        db = client[db_name]
-        if 'users' not in await db.list_collection_names():
-            continue
+def get_db():
+    """Get the app database from the shared client (created on first use)."""
+    global _client
+    if _client is None:
+        _client = AsyncIOMotorClient(
+            os.getenv('MONGODB_URI'),
+            maxPoolSize=10,
+            serverSelectionTimeoutMS=5000,
+        )
+    return _client[DB_NAME]
+
+
+# Placeholder choices for migrated turns (3 required); shared by every turn
+PLACEHOLDER_CHOICES = [
+    "Geschichte fortsetzen...",
+    "Geschichte fortsetzen...",
+    "Geschichte fortsetzen..."
+]
+
 
-        # Try different field names
-        for field in ['username', 'name']:
-            user = await db.users.find_one({field: username})
-            if user:
-                print(f'✅ Found user "{username}" in {db_name}.users')
-                print(f'   User ID: {user["_id"]}')
-                client.close()
-                return str(user['_id']), db_name
+async def find_user(username: str):
+    """Find user by username in the app database.
+
+    Sessions are only ever read from humanbenchmark, so users from other
+    databases could not be migrated anyway.
+    """
+    db_name = DB_NAME
+    db = get_db()
+
+    # Probe both field names concurrently; 'username' wins over 'name'
+    fields = ['username', 'name']
+    results = await asyncio.gather(
+        *(db.users.find_one({field: username}, {'_id': 1}) for field in fields)
+    )
+
+    user = next((u for u in results if u), None)
+    if user:
+        print(f'✅ Found user "{username}" in {db_name}.users')
+        print(f'   User ID: {user["_id"]}')
+        return str(user['_id']), db_name
 
-    client.close()
     return None, None
 
 
 async def find_sessions(user_id: str, search_text: str = None):
     """Find game sessions for a user."""
-    uri = os.getenv('MONGODB_URI')
-    client = AsyncIOMotorClient(uri)
-    db = client['humanbenchmark']
+    db = get_db()
 
     query = {
         'gameType': 'maerchenweber',
         'userId': user_id
     }
 
-    sessions = await db.gamesessions.find(query).to_list(None)
+    # Listing only needs metadata, the old history and whether turns exist
+    projection = {
+        'character_name': 1,
+        'story_theme': 1,
+        'history': 1,
+        'turns.round': 1,
+        'createdAt': 1,
+    }
+    sessions = await db.gamesessions.find(query, projection).to_list(None)
 
     print(f'\n📚 Found {len(sessions)} Märchenweber session(s) for this user:\n')
 
@@ -98,21 +128,63 @@ async def find_sessions(user_id: str, search_text: str = None):
         matching.append(session)
         print()
 
-    client.close()
     return matching
 
 
+def convert_history(session: dict) -> list:
+    """Convert a session's old string history into turns (prints a preview)."""
+    history = session.get('history', [])
+
+    print(f'\n🔄 Converting {len(history)} history entries to turns...')
+
+    # History format: alternating story text and user choices
+    # Story text, "[Wahl]: choice text", story text, "[Wahl]: choice text", ...
+    # One pass splits it into parallel story/choice lists. A choice only belongs
+    # to the story directly before it; stray choices are dropped.
+    is_choice = [isinstance(h, str) and h.startswith('[Wahl]:') for h in history]
+
+    stories = []
+    choices = []
+    for i, entry in enumerate(history):
+        if not is_choice[i]:
+            stories.append(entry if isinstance(entry, str) else str(entry))
+            choices.append(None)
+        elif i > 0 and not is_choice[i - 1]:
+            choices[-1] = entry.replace('[Wahl]:', '').strip()
+
+    timestamp = session.get('createdAt', datetime.utcnow())
+    turns = [
+        {
+            'round': turn_number,  # Backend expects 'round', not 'turn_number'
+            'choice_made': user_choice,  # Backend expects 'choice_made', not 'user_choice'
+            'story_text': story_text,
+            'choices': PLACEHOLDER_CHOICES,  # Frontend needs 3 choices
+            'image_url': None,
+            'fun_nugget': "",  # Backend requires this field
+            'started_at': timestamp,
+            'completed_at': timestamp
+        }
+        for turn_number, (story_text, user_choice) in enumerate(zip(stories, choices))
+    ]
+
+    # Show preview
+    for turn_number, (story_text, user_choice) in enumerate(zip(stories, choices)):
+        preview = story_text[:80] + '...' if len(story_text) > 80 else story_text
+        print(f'  Turn {turn_number}: {preview}')
+        if user_choice:
+            print(f'    → Choice: {user_choice}')
+
+    return turns
+
+
 async def migrate_session(session_id: str, dry_run: bool = True):
     """Migrate a session from history to turns format."""
-    uri = os.getenv('MONGODB_URI')
-    client = AsyncIOMotorClient(uri)
-    db = client['humanbenchmark']
+    db = get_db()
 
     session = await db.gamesessions.find_one({'_id': ObjectId(session_id)})
 
     if not session:
         print(f'❌ Session {session_id} not found')
-        client.close()
         return False
 
     print(f'\n📖 Migrating session: {session_id}')
@@ -125,73 +197,15 @@ async def migrate_session(session_id: str, dry_run: bool = True):
         overwrite = input('   Overwrite existing turns? (yes/no): ').strip().lower()
         if overwrite != 'yes':
             print('❌ Migration cancelled')
-            client.close()
             return False
 
     history = session.get('history', [])
 
     if not history:
         print('❌ No history to migrate')
-        client.close()
         return False
 
-    print(f'\n🔄 Converting {len(history)} history entries to turns...')
-
-    turns = []
-    turn_number = 0
-
-    # History format: alternating story text and user choices
-    # Story text, "[Wahl]: choice text", story text, "[Wahl]: choice text", ...
-    i = 0
-    while i < len(history):
-        entry = history[i]
-
-        # Skip if this is a choice (shouldn't happen as first entry)
-        if isinstance(entry, str) and entry.startswith('[Wahl]:'):
-            i += 1
-            continue
-
-        story_text = entry if isinstance(entry, str) else str(entry)
-
-        # Look for user choice in next entry
-        user_choice = None
-        if i + 1 < len(history):
-            next_entry = history[i + 1]
-            if isinstance(next_entry, str) and next_entry.startswith('[Wahl]:'):
-                user_choice = next_entry.replace('[Wahl]:', '').strip()
-                i += 2  # Skip both story and choice
-            else:
-                i += 1  # Only story, no choice yet
-        else:
-            i += 1
-
-        # Generate placeholder choices (3 required)
-        placeholder_choices = [
-            "Geschichte fortsetzen...",
-            "Geschichte fortsetzen...",
-            "Geschichte fortsetzen..."
-        ]
-
-        turn_data = {
-            'round': turn_number,  # Backend expects 'round', not 'turn_number'
-            'choice_made': user_choice,  # Backend expects 'choice_made', not 'user_choice'
-            'story_text': story_text,
-            'choices': placeholder_choices,  # Frontend needs 3 choices
-            'image_url': None,
-            'fun_nugget': "",  # Backend requires this field
-            'started_at': session.get('createdAt', datetime.utcnow()),
-            'completed_at': session.get('createdAt', datetime.utcnow())
-        }
-
-        turns.append(turn_data)
-
-        # Show preview
-        preview = story_text[:80] + '...' if len(story_text) > 80 else story_text
-        print(f'  Turn {turn_number}: {preview}')
-        if user_choice:
-            print(f'    → Choice: {user_choice}')
-
-        turn_number += 1
+    turns = convert_history(session)
 
     print(f'\n✅ Created {len(turns)} turns')
 
@@ -213,14 +227,61 @@ async def migrate_session(session_id: str, dry_run: bool = True):
 
     if result.modified_count > 0:
         print('\n✅ Migration successful!')
-        client.close()
         return True
     else:
         print('\n❌ Migration failed')
-        client.close()
         return False
 
 
+async def migrate_sessions_bulk(sessions: list):
+    """Migrate several sessions with one confirmation and one bulk_write."""
+    prepared = []
+    for session in sessions:
+        print(f'\n📖 Session: {session["_id"]}')
+        print(f'   Character: {session.get("character_name", "N/A")}')
+        print(f'   Theme: {session.get("story_theme", "N/A")}')
+
+        if not session.get('history'):
+            print('❌ No history to migrate - skipping')
+            continue
+
+        prepared.append((session, convert_history(session)))
+
+    if not prepared:
+        print('\n❌ Nothing to migrate')
+        return False
+
+    total_turns = sum(len(turns) for _, turns in prepared)
+    confirm = input(
+        f'\n❓ Apply migration to {len(prepared)} session(s) ({total_turns} turns)? (yes/no): '
+    ).strip().lower()
+    if confirm != 'yes':
+        print('❌ Migration cancelled')
+        return False
+
+    migrated_at = datetime.utcnow()
+    ops = [
+        UpdateOne(
+            {'_id': session['_id']},
+            {
+                '$set': {
+                    'turns': turns,
+                    'migrated_at': migrated_at,
+                    'migration_note': 'Migrated from old string history format'
+                }
+            }
+        )
+        for session, turns in prepared
+    ]
+
+    db = get_db()
+
+    result = await db.gamesessions.bulk_write(ops, ordered=False)
+
+    print(f'\n✅ Migrated {result.modified_count}/{len(ops)} session(s)')
+    return result.modified_count == len(ops)
+
+
 async def main():
     print('🔍 Märchenweber Story Migration Tool\n')
 
@@ -235,7 +296,7 @@ async def main():
     user_id, db_name = await find_user(username)
 
     if not user_id:
-        print(f'\n❌ User "{username}" not found in any database')
+        print(f'\n❌ User "{username}" not found')
         return
 
     # Step 3: Optional content search
@@ -289,6 +350,10 @@ async def main():
     if not isinstance(selected, list):
         selected = [selected]
 
+    if len(selected) > 1:
+        await migrate_sessions_bulk(selected)
+        return
+
     for session in selected:
         session_id = str(session['_id'])
 
@@ -306,5 +371,14 @@ async def main():
             print('\n' + '='*60 + '\n')
 
 
+async def run():
+    # Fail fast on a bad URI/network before prompting for anything
+    await get_db().command('ping')
+    try:
+        await main()
+    finally:
+        _client.close()
+
+
 if __name__ == '__main__':
-    asyncio.run(main())
+    asyncio.run(run())